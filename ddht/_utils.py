@@ -44,7 +44,10 @@ def sxor(s1: bytes, s2: bytes) -> bytes:
     """
     if len(s1) != len(s2):
         raise ValueError("Cannot sxor strings of different length")
-    return bytes(x ^ y for x, y in zip(s1, s2))
+    # XOR the strings as integers rather than byte by byte, which avoids a
+    # Python level loop over every byte.
+    xored = int.from_bytes(s1, "big") ^ int.from_bytes(s2, "big")
+    return xored.to_bytes(len(s1), "big")
 
 
 AsyncFnsAndArgsType = Union[Callable[..., Awaitable[Any]], Tuple[Any, ...]]
@@ -1,6 +1,5 @@
-from abc import ABC, abstractmethod
+from abc import ABC, ABCMeta, abstractmethod
 import argparse
-from collections import UserDict
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -9,11 +8,13 @@ from typing import (
     Container,
     ContextManager,
     Deque,
+    Dict,
     Generic,
     Hashable,
     Iterator,
     List,
     Optional,
+    Sequence,
     Set,
     Sized,
     Tuple,
@@ -116,14 +117,27 @@ class EventAPI(Generic[TEventPayload]):
         ...
 
 
+class _AbstractDict(Dict[Any, Any]):
+    # `dict.__new__` bypasses the abstract method check done by
+    # `object.__new__` so it has to be repeated here.
+    def __new__(cls, *args: Any, **kwargs: Any) -> "_AbstractDict":
+        abstract_methods = getattr(cls, "__abstractmethods__", None)
+        if abstract_methods:
+            raise TypeError(
+                f"Can't instantiate abstract class {cls.__name__} with abstract "
+                f"methods {', '.join(sorted(abstract_methods))}"
+            )
+        return super().__new__(cls, *args, **kwargs)
+
+
 # https://github.com/python/mypy/issues/5264#issuecomment-399407428
 if TYPE_CHECKING:
-    MessageTypeRegistryBaseType = UserDict[int, Type[BaseMessage]]
+    MessageTypeRegistryBaseType = Dict[int, Type[BaseMessage]]
 else:
-    MessageTypeRegistryBaseType = UserDict
+    MessageTypeRegistryBaseType = _AbstractDict
 
 
-class MessageTypeRegistryAPI(MessageTypeRegistryBaseType):
+class MessageTypeRegistryAPI(MessageTypeRegistryBaseType, metaclass=ABCMeta):
     @abstractmethod
     def register(self, message_data_class: Type[BaseMessage]) -> Type[BaseMessage]:
         ...
@@ -155,6 +169,10 @@ class RoutingTableAPI(ABC):
     def update(self, node_id: NodeID) -> Optional[NodeID]:
         ...
 
+    @abstractmethod
+    def bulk_update(self, node_ids: Sequence[NodeID]) -> None:
+        ...
+
     @abstractmethod
     def update_bucket_unchecked(self, node_id: NodeID) -> None:
         ...
@@ -241,14 +259,14 @@ class HandshakeSchemeAPI(ABC, Generic[TSignatureInputs]):
 
 # https://github.com/python/mypy/issues/5264#issuecomment-399407428
 if TYPE_CHECKING:
-    HandshakeSchemeRegistryBaseType = UserDict[
+    HandshakeSchemeRegistryBaseType = Dict[
         Type[IdentitySchemeAPI], Type[HandshakeSchemeAPI[Any]]
     ]
 else:
-    HandshakeSchemeRegistryBaseType = UserDict
+    HandshakeSchemeRegistryBaseType = _AbstractDict
 
 
-class HandshakeSchemeRegistryAPI(HandshakeSchemeRegistryBaseType):
+class HandshakeSchemeRegistryAPI(HandshakeSchemeRegistryBaseType, metaclass=ABCMeta):
     @abstractmethod
     def register(
         self, handshake_scheme_class: Type[HandshakeSchemeAPI[TSignatureInputs]]
@@ -271,6 +289,8 @@ class RPCResponse(TypedDict, total=False):
 
 
 class RPCHandlerAPI(ABC):
+    __slots__ = ()
+
     @abstractmethod
     async def __call__(self, request: RPCRequest) -> RPCResponse:
         ...
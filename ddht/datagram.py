@@ -36,11 +36,17 @@ async def DatagramReceiver(
     """Read datagrams from a socket and send them to a channel."""
     logger = get_extended_debug_logger("ddht.DatagramReceiver")
 
+    # A single receive buffer is reused for every datagram so that each read
+    # only allocates a `bytes` object of the exact size that was received.
+    receive_buffer = bytearray(DISCOVERY_DATAGRAM_BUFFER_SIZE)
+    receive_view = memoryview(receive_buffer)
+
     async with inbound_datagram_send_channel:
         while manager.is_running:
-            datagram, (ip_address, port) = await sock.recvfrom(
-                DISCOVERY_DATAGRAM_BUFFER_SIZE
+            num_bytes, (ip_address, port) = await sock.recvfrom_into(
+                receive_buffer, DISCOVERY_DATAGRAM_BUFFER_SIZE
             )
+            datagram = bytes(receive_view[:num_bytes])
             endpoint = Endpoint(inet_aton(ip_address), port)
             logger.debug2("Received %d bytes from %s", len(datagram), endpoint)
             inbound_datagram = InboundDatagram(datagram, endpoint)
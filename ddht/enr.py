@@ -1,8 +1,10 @@
+import sqlite3
 from typing import Iterable, Sequence, Tuple
 
-from eth_enr import ENRAPI
+from eth_enr import ENRAPI, QueryableENRDB
 from eth_enr.constants import MAX_ENR_SIZE
 from eth_enr.sedes import ENRSedes
+from eth_enr.sqlite3_db import FIELD_INSERT_QUERY, RECORD_INSERT_QUERY, Record
 import rlp
 from rlp.sedes import CountableList
 
@@ -44,3 +46,30 @@ def partition_enrs(
         )
 
     return tuple(_partition_enrs(enrs, max_payload_size))
+
+
+def set_enrs(enr_db: QueryableENRDB, enrs: Iterable[ENRAPI]) -> None:
+    """
+    Write multiple records to the database within a single transaction.
+
+    Records for which the database already holds an entry with the same sequence
+    number are skipped, which is the case in which `set_enr` would raise
+    `OldSequenceNumber`.
+    """
+    connection = enr_db.connection
+
+    with connection:
+        if not connection.in_transaction:
+            connection.execute("BEGIN")
+
+        for enr in enrs:
+            record = Record.from_enr(enr)
+            field_params = tuple(field.to_database_params() for field in record.fields)
+
+            connection.execute("SAVEPOINT set_enr")
+            try:
+                connection.execute(RECORD_INSERT_QUERY, record.to_database_params())
+                connection.executemany(FIELD_INSERT_QUERY, field_params)
+            except sqlite3.IntegrityError:
+                connection.execute("ROLLBACK TO set_enr")
+            connection.execute("RELEASE set_enr")
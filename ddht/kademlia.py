@@ -13,6 +13,7 @@ from typing import (
     Iterator,
     List,
     Optional,
+    Sequence,
     Set,
     Tuple,
     Type,
@@ -175,11 +176,31 @@ class KademliaRoutingTable(RoutingTableAPI):
         if node_id == self.center_node_id:
             raise ValueError("Cannot insert center node into routing table")
 
-        (
-            bucket_index,
-            bucket,
-            replacement_cache,
-        ) = self.get_index_bucket_and_replacement_cache(node_id)
+        bucket_index = compute_log_distance(self.center_node_id, node_id) - 1
+        return self._update_at_index(node_id, bucket_index)
+
+    def bulk_update(self, node_ids: Sequence[NodeID]) -> None:
+        """
+        Insert or update multiple nodes in the given order.
+
+        This is equivalent to calling `update` for each node id in turn, except that the
+        eviction candidates are discarded. The bucket of every node is computed upfront in a
+        single pass.
+        """
+        if self.center_node_id in node_ids:
+            raise ValueError("Cannot insert center node into routing table")
+
+        center_node_id_int = big_endian_to_int(self.center_node_id)
+        bucket_indices = tuple(
+            (center_node_id_int ^ big_endian_to_int(node_id)).bit_length() - 1
+            for node_id in node_ids
+        )
+        for node_id, bucket_index in zip(node_ids, bucket_indices):
+            self._update_at_index(node_id, bucket_index)
+
+    def _update_at_index(self, node_id: NodeID, bucket_index: int) -> Optional[NodeID]:
+        bucket = self.buckets[bucket_index]
+        replacement_cache = self.replacement_caches[bucket_index]
 
         is_bucket_full = len(bucket) >= self.bucket_size
         is_node_in_bucket = node_id in bucket
@@ -188,13 +209,13 @@ class KademliaRoutingTable(RoutingTableAPI):
             self.logger.debug2(
                 "Adding %s to bucket %d", encode_hex(node_id), bucket_index
             )
-            self.update_bucket_unchecked(node_id)
+            self._update_bucket_unchecked_at_index(node_id, bucket_index)
             eviction_candidate = None
         elif is_node_in_bucket:
             self.logger.debug2(
                 "Updating %s in bucket %d", encode_hex(node_id), bucket_index
             )
-            self.update_bucket_unchecked(node_id)
+            self._update_bucket_unchecked_at_index(node_id, bucket_index)
             eviction_candidate = None
         elif not is_node_in_bucket and is_bucket_full:
             if node_id not in replacement_cache:
@@ -219,11 +240,14 @@ class KademliaRoutingTable(RoutingTableAPI):
 
     def update_bucket_unchecked(self, node_id: NodeID) -> None:
         """Add or update assuming the node is either present already or the bucket is not full."""
-        (
-            bucket_index,
-            bucket,
-            replacement_cache,
-        ) = self.get_index_bucket_and_replacement_cache(node_id)
+        bucket_index = compute_log_distance(self.center_node_id, node_id) - 1
+        self._update_bucket_unchecked_at_index(node_id, bucket_index)
+
+    def _update_bucket_unchecked_at_index(
+        self, node_id: NodeID, bucket_index: int
+    ) -> None:
+        bucket = self.buckets[bucket_index]
+        replacement_cache = self.replacement_caches[bucket_index]
 
         for container in (bucket, replacement_cache):
             try:
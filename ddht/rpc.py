@@ -147,6 +147,8 @@ class RPCHandler(RPCHandlerAPI, Generic[TParams, TResult]):
     implementation.
     """
 
+    __slots__ = ()
+
     async def __call__(self, request: RPCRequest) -> RPCResponse:
         try:
             params = self.extract_params(request)
@@ -26,6 +26,8 @@ from ddht.v5.typing import HandshakeResult, Tag
 
 
 class HandshakeParticipantAPI(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def __init__(
         self,
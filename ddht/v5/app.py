@@ -1,7 +1,6 @@
 import sqlite3
 
 from eth_enr import ENRManager, QueryableENRDB, default_identity_scheme_registry
-from eth_enr.exceptions import OldSequenceNumber
 from eth_keys import keys
 from eth_utils import encode_hex
 import trio
@@ -14,6 +13,7 @@ from ddht.constants import (
     IP_V4_ADDRESS_ENR_KEY,
     ROUTING_TABLE_BUCKET_SIZE,
 )
+from ddht.enr import set_enrs
 from ddht.kademlia import KademliaRoutingTable
 from ddht.typing import AnyIPAddress
 from ddht.upnp import UPnPService
@@ -46,6 +46,7 @@ class Application(BaseApplication):
         self.enr_db = enr_db
 
         local_private_key = get_local_private_key(self._boot_info)
+        local_private_key_bytes = local_private_key.to_bytes()
 
         enr_manager = ENRManager(private_key=local_private_key, enr_db=enr_db,)
 
@@ -71,12 +72,10 @@ class Application(BaseApplication):
         )
         self.routing_table = routing_table
 
-        for enr in self._boot_info.bootnodes:
-            try:
-                enr_db.set_enr(enr)
-            except OldSequenceNumber:
-                pass
-            routing_table.update(enr.node_id)
+        set_enrs(enr_db, self._boot_info.bootnodes)
+        routing_table.bulk_update(
+            tuple(enr.node_id for enr in self._boot_info.bootnodes)
+        )
 
         sock = trio.socket.socket(
             family=trio.socket.AF_INET, type=trio.socket.SOCK_DGRAM
@@ -84,10 +83,10 @@ class Application(BaseApplication):
 
         client = Client(local_private_key, enr_db, enr_manager.enr.node_id, sock)
 
-        endpoint_vote_channels = trio.open_memory_channel[EndpointVote](0)
+        endpoint_vote_channels = trio.open_memory_channel[EndpointVote](16)
 
         endpoint_tracker = EndpointTracker(
-            local_private_key=local_private_key.to_bytes(),
+            local_private_key=local_private_key_bytes,
             local_node_id=enr_manager.enr.node_id,
             enr_db=enr_db,
             identity_scheme_registry=identity_scheme_registry,
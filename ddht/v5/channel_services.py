@@ -1,11 +1,15 @@
 import logging
+from socket import inet_aton
 from typing import NamedTuple
 
 from async_service import ManagerAPI, as_service
 from eth_utils import ValidationError
+import trio
 from trio.abc import ReceiveChannel, SendChannel
+from trio.socket import SocketType
 
-from ddht.datagram import InboundDatagram, OutboundDatagram
+from ddht.constants import DISCOVERY_DATAGRAM_BUFFER_SIZE
+from ddht.datagram import InboundDatagram, OutboundDatagram, send_datagram
 from ddht.endpoint import Endpoint
 from ddht.v5.packets import Packet, decode_packet
 
@@ -70,3 +74,71 @@ async def PacketEncoder(
             outbound_datagram = OutboundDatagram(packet.to_wire_bytes(), endpoint)
             logger.debug(f"Encoded {packet.__class__.__name__} for {endpoint}")
             await outbound_datagram_send_channel.send(outbound_datagram)
+
+
+#
+# Combined socket IO and packet encoding/decoding
+#
+async def _receive_packets(
+    manager: ManagerAPI,
+    sock: SocketType,
+    inbound_packet_send_channel: SendChannel[InboundPacket],
+) -> None:
+    logger = logging.getLogger("ddht.v5.channel_services.PacketIO")
+
+    receive_buffer = bytearray(DISCOVERY_DATAGRAM_BUFFER_SIZE)
+    receive_view = memoryview(receive_buffer)
+
+    async with inbound_packet_send_channel:
+        while manager.is_running:
+            num_bytes, (ip_address, port) = await sock.recvfrom_into(
+                receive_buffer, DISCOVERY_DATAGRAM_BUFFER_SIZE
+            )
+            endpoint = Endpoint(inet_aton(ip_address), port)
+            try:
+                packet = decode_packet(bytes(receive_view[:num_bytes]))
+            except ValidationError:
+                logger.debug(
+                    f"Failed to decode a packet from {endpoint}", exc_info=True
+                )
+                continue
+
+            logger.debug(
+                f"Successfully decoded {packet.__class__.__name__} from {endpoint}"
+            )
+            try:
+                await inbound_packet_send_channel.send(InboundPacket(packet, endpoint))
+            except trio.BrokenResourceError:
+                logger.debug("PacketIO exiting due to `trio.BrokenResourceError`")
+                manager.cancel()
+                return
+
+
+async def _send_packets(
+    sock: SocketType, outbound_packet_receive_channel: ReceiveChannel[OutboundPacket],
+) -> None:
+    logger = logging.getLogger("ddht.v5.channel_services.PacketIO")
+
+    async with outbound_packet_receive_channel:
+        async for packet, endpoint in outbound_packet_receive_channel:
+            await send_datagram(sock, packet.to_wire_bytes(), endpoint)
+            logger.debug(f"Sent {packet.__class__.__name__} to {endpoint}")
+
+
+@as_service
+async def PacketIO(
+    manager: ManagerAPI,
+    sock: SocketType,
+    outbound_packet_receive_channel: ReceiveChannel[OutboundPacket],
+    inbound_packet_send_channel: SendChannel[InboundPacket],
+) -> None:
+    """
+    Send outbound packets via a socket and decode the packets read from it.
+
+    This does the work of `DatagramSender`/`PacketEncoder` and
+    `DatagramReceiver`/`PacketDecoder` without passing datagrams through
+    intermediate channels, so each packet only takes a single hop between tasks.
+    """
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(_send_packets, sock, outbound_packet_receive_channel)
+        nursery.start_soon(_receive_packets, manager, sock, inbound_packet_send_channel)
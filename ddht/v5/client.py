@@ -7,18 +7,7 @@ from eth_typing import NodeID
 import trio
 
 from ddht.base_message import AnyInboundMessage, AnyOutboundMessage
-from ddht.datagram import (
-    DatagramReceiver,
-    DatagramSender,
-    InboundDatagram,
-    OutboundDatagram,
-)
-from ddht.v5.channel_services import (
-    InboundPacket,
-    OutboundPacket,
-    PacketDecoder,
-    PacketEncoder,
-)
+from ddht.v5.channel_services import InboundPacket, OutboundPacket, PacketIO
 from ddht.v5.message_dispatcher import MessageDispatcher
 from ddht.v5.messages import v5_registry
 from ddht.v5.packer import Packer
@@ -37,26 +26,17 @@ class Client(Service):
 
         self.enr_db = enr_db
 
-        outbound_datagram_channels = trio.open_memory_channel[OutboundDatagram](0)
-        inbound_datagram_channels = trio.open_memory_channel[InboundDatagram](0)
-        outbound_packet_channels = trio.open_memory_channel[OutboundPacket](0)
-        inbound_packet_channels = trio.open_memory_channel[InboundPacket](0)
-        outbound_message_channels = trio.open_memory_channel[AnyOutboundMessage](0)
-        inbound_message_channels = trio.open_memory_channel[AnyInboundMessage](0)
+        # Bounded buffers decouple the stages of the pipeline so that each item
+        # does not require a rendezvous between producer and consumer, while
+        # still applying backpressure once a stage falls behind.
+        outbound_packet_channels = trio.open_memory_channel[OutboundPacket](128)
+        inbound_packet_channels = trio.open_memory_channel[InboundPacket](128)
+        outbound_message_channels = trio.open_memory_channel[AnyOutboundMessage](32)
+        inbound_message_channels = trio.open_memory_channel[AnyInboundMessage](32)
 
         # types ignored due to https://github.com/ethereum/async-service/issues/5
-        datagram_sender = DatagramSender(  # type: ignore
-            outbound_datagram_channels[1], sock
-        )
-        datagram_receiver = DatagramReceiver(  # type: ignore
-            sock, inbound_datagram_channels[0]
-        )
-
-        packet_encoder = PacketEncoder(  # type: ignore
-            outbound_packet_channels[1], outbound_datagram_channels[0]
-        )
-        packet_decoder = PacketDecoder(  # type: ignore
-            inbound_datagram_channels[1], inbound_packet_channels[0]
+        packet_io = PacketIO(  # type: ignore
+            sock, outbound_packet_channels[1], inbound_packet_channels[0]
         )
 
         self.packer = Packer(
@@ -77,10 +57,7 @@ class Client(Service):
         )
 
         self.services = (
-            packet_encoder,
-            datagram_sender,
-            datagram_receiver,
-            packet_decoder,
+            packet_io,
             self.packer,
             self.message_dispatcher,
         )
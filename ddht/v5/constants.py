@@ -53,4 +53,7 @@ LOOKUP_PARALLELIZATION_FACTOR = 3  # number of parallel lookup requests (aka alp
 
 MAX_NODES_MESSAGE_TOTAL = 8  # max allowed total value for nodes messages
 
+# max number of inbound messages the message dispatcher handles in a single batch
+INBOUND_MESSAGE_BATCH_SIZE = 64
+
 ID_NONCE_SIGNATURE_PREFIX = b"discovery-id-nonce"
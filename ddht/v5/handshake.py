@@ -1,8 +1,8 @@
-import secrets
+import functools
 from typing import Any, Optional, Type
 
+import coincurve
 from eth_enr.abc import ENRAPI, IdentitySchemeAPI
-from eth_keys.datatypes import PublicKey
 from eth_typing import NodeID
 from eth_utils import ValidationError, encode_hex
 
@@ -18,14 +18,40 @@ from ddht.v5.packets import (
     Packet,
     WhoAreYouPacket,
     get_random_auth_tag,
-    get_random_encrypted_data,
+    get_random_auth_tag_and_encrypted_data,
     get_random_id_nonce,
 )
-from ddht.v5.tags import compute_tag, recover_source_id_from_tag
+from ddht.v5.tags import (
+    compute_node_id_hash,
+    compute_tag,
+    recover_source_id_from_tag_with_hash,
+)
 from ddht.v5.typing import HandshakeResult, Tag
 
 
+@functools.lru_cache(maxsize=1024)
+def _uncompress_public_key(compressed_public_key: bytes) -> bytes:
+    """
+    Return the uncompressed form of a compressed secp256k1 public key.
+
+    Decompression requires a modular square root so the result is cached for
+    peers we handshake with repeatedly.
+    """
+    public_key = coincurve.keys.PublicKey(compressed_public_key)
+    # strip the leading `0x04` prefix of the SEC1 encoding
+    return public_key.format(compressed=False)[1:]
+
+
 class BaseHandshakeParticipant(HandshakeParticipantAPI):
+    __slots__ = (
+        "_is_initiator",
+        "_local_enr",
+        "_local_private_key",
+        "_remote_node_id",
+        "_tag",
+        "_handshake_scheme",
+    )
+
     _handshake_scheme_registry: HandshakeSchemeRegistryAPI = v5_handshake_scheme_registry
 
     def __init__(
@@ -41,6 +67,11 @@ class BaseHandshakeParticipant(HandshakeParticipantAPI):
         self._local_private_key = local_private_key
         self._remote_node_id = remote_node_id
 
+        self._tag = compute_tag(
+            source_node_id=self.local_node_id, destination_node_id=self.remote_node_id
+        )
+        self._handshake_scheme: Optional[Type[HandshakeSchemeAPI[Any]]] = None
+
     @property
     def is_initiator(self) -> bool:
         return self._is_initiator
@@ -63,16 +94,22 @@ class BaseHandshakeParticipant(HandshakeParticipantAPI):
 
     @property
     def tag(self) -> Tag:
-        return compute_tag(
-            source_node_id=self.local_node_id, destination_node_id=self.remote_node_id
-        )
+        return self._tag
 
     @property
     def handshake_scheme(self) -> Type[HandshakeSchemeAPI[Any]]:
-        return self._handshake_scheme_registry[self.identity_scheme]
+        # Looked up lazily as the identity scheme is only known once the
+        # subclass has finished initialization.
+        if self._handshake_scheme is None:
+            self._handshake_scheme = self._handshake_scheme_registry[
+                self.identity_scheme
+            ]
+        return self._handshake_scheme
 
 
 class HandshakeInitiator(BaseHandshakeParticipant):
+    __slots__ = ("remote_enr", "initial_message", "_initiating_packet")
+
     def __init__(
         self,
         *,
@@ -90,11 +127,18 @@ class HandshakeInitiator(BaseHandshakeParticipant):
         self.remote_enr = remote_enr
         self.initial_message = initial_message
 
-        self.initiating_packet = AuthTagPacket.prepare_random(
-            tag=self.tag,
-            auth_tag=get_random_auth_tag(),
-            random_data=get_random_encrypted_data(),
-        )
+        self._initiating_packet: Optional[AuthTagPacket] = None
+
+    @property
+    def initiating_packet(self) -> AuthTagPacket:
+        # Built lazily so that initiators which are discarded before sending
+        # anything don't draw from the random number generator.
+        if self._initiating_packet is None:
+            auth_tag, random_data = get_random_auth_tag_and_encrypted_data()
+            self._initiating_packet = AuthTagPacket.prepare_random(
+                tag=self.tag, auth_tag=auth_tag, random_data=random_data,
+            )
+        return self._initiating_packet
 
     @property
     def identity_scheme(self) -> Type[IdentitySchemeAPI]:
@@ -105,8 +149,9 @@ class HandshakeInitiator(BaseHandshakeParticipant):
         return self.initiating_packet
 
     def is_response_packet(self, packet: Packet) -> bool:
-        return isinstance(packet, WhoAreYouPacket) and secrets.compare_digest(
-            packet.token, self.initiating_packet.auth_tag
+        return (
+            isinstance(packet, WhoAreYouPacket)
+            and packet.token == self.initiating_packet.auth_tag
         )
 
     def complete_handshake(self, response_packet: Packet) -> HandshakeResult:
@@ -117,18 +162,18 @@ class HandshakeInitiator(BaseHandshakeParticipant):
         if not isinstance(response_packet, WhoAreYouPacket):
             raise TypeError("Invariant: Only WhoAreYou packets are valid responses")
         who_are_you_packet = response_packet
+        handshake_scheme = self.handshake_scheme
 
         # compute session keys
         (
             ephemeral_private_key,
             ephemeral_public_key,
-        ) = self.handshake_scheme.create_handshake_key_pair()
+        ) = handshake_scheme.create_handshake_key_pair()
 
-        remote_public_key_object = PublicKey.from_compressed_bytes(
+        remote_public_key_uncompressed = _uncompress_public_key(
             self.remote_enr.public_key
         )
-        remote_public_key_uncompressed = remote_public_key_object.to_bytes()
-        session_keys = self.handshake_scheme.compute_session_keys(
+        session_keys = handshake_scheme.compute_session_keys(
             local_private_key=ephemeral_private_key,
             remote_public_key=remote_public_key_uncompressed,
             local_node_id=self.local_enr.node_id,
@@ -138,11 +183,11 @@ class HandshakeInitiator(BaseHandshakeParticipant):
         )
 
         # prepare response packet
-        signature_inputs = self.handshake_scheme.signature_inputs_cls(
+        signature_inputs = handshake_scheme.signature_inputs_cls(
             id_nonce=who_are_you_packet.id_nonce,
             ephemeral_public_key=ephemeral_public_key,
         )
-        id_nonce_signature = self.handshake_scheme.create_id_nonce_signature(
+        id_nonce_signature = handshake_scheme.create_id_nonce_signature(
             signature_inputs=signature_inputs, private_key=self.local_private_key,
         )
 
@@ -174,6 +219,8 @@ class HandshakeInitiator(BaseHandshakeParticipant):
 
 
 class HandshakeRecipient(BaseHandshakeParticipant):
+    __slots__ = ("remote_enr", "who_are_you_packet", "_local_node_id_hash")
+
     def __init__(
         self,
         *,
@@ -203,6 +250,7 @@ class HandshakeRecipient(BaseHandshakeParticipant):
             remote_node_id=remote_node_id,
         )
         self.remote_enr = remote_enr
+        self._local_node_id_hash = compute_node_id_hash(self.local_node_id)
 
         if self.remote_enr is not None:
             enr_sequence_number = self.remote_enr.sequence_number
@@ -226,7 +274,9 @@ class HandshakeRecipient(BaseHandshakeParticipant):
     def is_response_packet(self, packet: Packet) -> bool:
         return (
             isinstance(packet, AuthHeaderPacket)
-            and recover_source_id_from_tag(packet.tag, self.local_node_id)
+            and recover_source_id_from_tag_with_hash(
+                packet.tag, self._local_node_id_hash
+            )
             == self.remote_node_id
         )
 
@@ -236,17 +286,18 @@ class HandshakeRecipient(BaseHandshakeParticipant):
         if not isinstance(response_packet, AuthHeaderPacket):
             raise TypeError("Invariant: Only AuthHeader packets are valid responses")
         auth_header_packet = response_packet
+        handshake_scheme = self.handshake_scheme
 
         ephemeral_public_key = auth_header_packet.auth_header.ephemeral_public_key
         try:
-            self.handshake_scheme.validate_handshake_public_key(ephemeral_public_key)
+            handshake_scheme.validate_handshake_public_key(ephemeral_public_key)
         except ValidationError as error:
             raise HandshakeFailure(
                 f"AuthHeader packet from contains invalid ephemeral public key "
                 f"{encode_hex(ephemeral_public_key)}"
             ) from error
 
-        session_keys = self.handshake_scheme.compute_session_keys(
+        session_keys = handshake_scheme.compute_session_keys(
             local_private_key=self.local_private_key,
             remote_public_key=ephemeral_public_key,
             local_node_id=self.local_enr.node_id,
@@ -255,6 +306,8 @@ class HandshakeRecipient(BaseHandshakeParticipant):
             is_locally_initiated=False,
         )
 
+        # The auth response and the message are encrypted under different
+        # session keys, so the two decryptions cannot share any cipher state.
         enr = self.decrypt_and_validate_auth_response(
             auth_header_packet,
             session_keys.auth_response_key,
@@ -311,15 +364,17 @@ class HandshakeRecipient(BaseHandshakeParticipant):
 
             current_remote_enr = enr
 
-        signature_inputs = self.handshake_scheme.signature_inputs_cls(
+        remote_public_key = current_remote_enr.public_key
+        handshake_scheme = self.handshake_scheme
+        signature_inputs = handshake_scheme.signature_inputs_cls(
             id_nonce=id_nonce,
             ephemeral_public_key=auth_header_packet.auth_header.ephemeral_public_key,
         )
         try:
-            self.handshake_scheme.validate_id_nonce_signature(
+            handshake_scheme.validate_id_nonce_signature(
                 signature_inputs=signature_inputs,
                 signature=id_nonce_signature,
-                public_key=current_remote_enr.public_key,
+                public_key=remote_public_key,
             )
         except ValidationError as error:
             raise HandshakeFailure(
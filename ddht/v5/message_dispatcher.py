@@ -1,13 +1,16 @@
+import collections
 import contextlib
 import logging
-import random
+import os
 from types import TracebackType
 from typing import (
     AsyncGenerator,
     AsyncIterator,
     Callable,
     Dict,
+    List,
     Optional,
+    Sequence,
     Tuple,
     Type,
     TypeVar,
@@ -31,15 +34,42 @@ from ddht.endpoint import Endpoint
 from ddht.exceptions import UnexpectedMessage
 from ddht.v5.abc import ChannelHandlerSubscriptionAPI, MessageDispatcherAPI
 from ddht.v5.constants import (
+    INBOUND_MESSAGE_BATCH_SIZE,
     MAX_NODES_MESSAGE_TOTAL,
     MAX_REQUEST_ID,
     MAX_REQUEST_ID_ATTEMPTS,
 )
 from ddht.v5.messages import BaseMessage, NodesMessage
 
+# Buffer sizes of the channels feeding request and response handlers. The response
+# buffer fits a complete set of nodes messages sent in response to a single request.
+REQUEST_CHANNEL_BUFFER = 8
+RESPONSE_CHANNEL_BUFFER = MAX_NODES_MESSAGE_TOTAL
+
+
+# Random request ids are drawn from a pool that is refilled with a single `os.urandom`
+# call whenever it runs empty.
+REQUEST_ID_POOL_SIZE = 64
+_REQUEST_ID_SIZE = (MAX_REQUEST_ID.bit_length() + 7) // 8
+_request_id_pool: List[int] = []
+
+
+def _refill_request_id_pool() -> None:
+    random_bytes = os.urandom(REQUEST_ID_POOL_SIZE * _REQUEST_ID_SIZE)
+    _request_id_pool.extend(
+        request_id
+        for request_id in (
+            int.from_bytes(random_bytes[index : index + _REQUEST_ID_SIZE], "little")
+            for index in range(0, len(random_bytes), _REQUEST_ID_SIZE)
+        )
+        if request_id <= MAX_REQUEST_ID
+    )
+
 
 def get_random_request_id() -> int:
-    return random.randint(0, MAX_REQUEST_ID)
+    while not _request_id_pool:
+        _refill_request_id_pool()
+    return _request_id_pool.pop()
 
 
 ChannelContentType = TypeVar("ChannelContentType")
@@ -108,78 +138,155 @@ class MessageDispatcher(Service, MessageDispatcherAPI):
         self.request_handler_send_channels: Dict[
             int, SendChannel[AnyInboundMessage]
         ] = {}
+        # response handlers are keyed by the remote node id and then by the request id
         self.response_handler_send_channels: Dict[
-            Tuple[NodeID, int], SendChannel[AnyInboundMessage]
+            NodeID, Dict[int, SendChannel[AnyInboundMessage]]
         ] = {}
 
     async def run(self) -> None:
         async with self.inbound_message_receive_channel, self.outbound_message_send_channel:
-            async for inbound_message in self.inbound_message_receive_channel:
-                await self.handle_inbound_message(inbound_message)
+            while True:
+                try:
+                    inbound_messages = await self._receive_inbound_message_batch()
+                except trio.EndOfChannel:
+                    break
+                await self.handle_inbound_messages(inbound_messages)
+
+    async def _receive_inbound_message_batch(self) -> Tuple[AnyInboundMessage, ...]:
+        """
+        Wait for the next inbound message and return it together with those that are
+        already waiting in the channel, up to a total of `INBOUND_MESSAGE_BATCH_SIZE`.
+        """
+        receive_channel = self.inbound_message_receive_channel
+        inbound_messages = [await receive_channel.receive()]
+        while len(inbound_messages) < INBOUND_MESSAGE_BATCH_SIZE:
+            try:
+                # `receive_nowait` is only exposed by the memory channel types
+                inbound_messages.append(receive_channel.receive_nowait())  # type: ignore
+            except (trio.WouldBlock, trio.EndOfChannel):
+                break
+        return tuple(inbound_messages)
+
+    async def handle_inbound_messages(
+        self, inbound_messages: Sequence[AnyInboundMessage]
+    ) -> None:
+        """
+        Dispatch a batch of inbound messages to their handlers.
+
+        The messages are grouped by the handler channel they are destined for,
+        preserving the order of the messages on each channel. A single group is fed
+        directly, several groups are fed concurrently by one task each.
+        """
+        messages_by_channel: Dict[
+            SendChannel[AnyInboundMessage], List[AnyInboundMessage]
+        ] = collections.defaultdict(list)
+        for inbound_message in inbound_messages:
+            for send_channel in self._get_handler_send_channels(inbound_message):
+                messages_by_channel[send_channel].append(inbound_message)
+
+        if len(messages_by_channel) == 1:
+            ((send_channel, channel_messages),) = messages_by_channel.items()
+            await self._send_to_handler(send_channel, channel_messages)
+        elif messages_by_channel:
+            async with trio.open_nursery() as nursery:
+                for send_channel, channel_messages in messages_by_channel.items():
+                    nursery.start_soon(
+                        self._send_to_handler, send_channel, channel_messages
+                    )
 
-    async def handle_inbound_message(self, inbound_message: AnyInboundMessage) -> None:
+    async def _send_to_handler(
+        self,
+        send_channel: SendChannel[AnyInboundMessage],
+        inbound_messages: Sequence[AnyInboundMessage],
+    ) -> None:
+        for inbound_message in inbound_messages:
+            try:
+                await send_channel.send(inbound_message)
+            except (trio.BrokenResourceError, trio.ClosedResourceError):
+                # The handler has been removed since the batch was grouped, e.g.
+                # a request that has been answered by an earlier message.
+                self.logger.debug(
+                    "Dropping %s as its handler has been removed", inbound_message
+                )
+
+    def _get_handler_send_channels(
+        self, inbound_message: AnyInboundMessage
+    ) -> Tuple[SendChannel[AnyInboundMessage], ...]:
+        message = inbound_message.message
         sender_node_id = inbound_message.sender_node_id
-        message_type = inbound_message.message.message_type
-        request_id = inbound_message.message.request_id
+        message_type = message.message_type
+        request_id = message.request_id
+        logger = self.logger
 
-        is_request = message_type in self.request_handler_send_channels
-        is_response = (
-            sender_node_id,
-            request_id,
-        ) in self.response_handler_send_channels
+        request_send_channel = self.request_handler_send_channels.get(message_type)
+        node_response_send_channels = self.response_handler_send_channels.get(
+            sender_node_id
+        )
+        if node_response_send_channels is None:
+            response_send_channel = None
+        else:
+            response_send_channel = node_response_send_channels.get(request_id)
+        is_request = request_send_channel is not None
+        is_response = response_send_channel is not None
 
-        if is_request and is_response:
-            self.logger.debug(
-                "%s from %s is both a response to an earlier request (id %d) and a request a "
-                "handler is present for (message type %d). Message will be handled twice.",
-                inbound_message,
-                encode_hex(sender_node_id),
-                request_id,
-                message_type,
-            )
         if not is_request and not is_response:
-            self.logger.debug(
-                "Dropping %s from %s (request id %d, message type %d) as neither a request nor a "
-                "response handler is present",
-                inbound_message,
-                encode_hex(sender_node_id),
-                request_id,
-                message_type,
-            )
-            await trio.lowlevel.checkpoint()
-
-        if is_request:
-            self.logger.debug(
-                "Received request %s with id %d from %s",
-                inbound_message,
-                request_id,
-                encode_hex(sender_node_id),
-            )
-            send_channel = self.request_handler_send_channels[message_type]
-            await send_channel.send(inbound_message)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Dropping %s from %s (request id %d, message type %d) as neither a "
+                    "request nor a response handler is present",
+                    inbound_message,
+                    encode_hex(sender_node_id),
+                    request_id,
+                    message_type,
+                )
+            return ()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            hex_sender = encode_hex(sender_node_id)
+            if is_request and is_response:
+                logger.debug(
+                    "%s from %s is both a response to an earlier request (id %d) and a request "
+                    "a handler is present for (message type %d). Message will be handled "
+                    "twice.",
+                    inbound_message,
+                    hex_sender,
+                    request_id,
+                    message_type,
+                )
+            if is_request:
+                logger.debug(
+                    "Received request %s with id %d from %s",
+                    inbound_message,
+                    request_id,
+                    hex_sender,
+                )
+            if is_response:
+                logger.debug(
+                    "Received response %s for request with id %d from %s",
+                    inbound_message,
+                    request_id,
+                    hex_sender,
+                )
 
-        if is_response:
-            self.logger.debug(
-                "Received response %s for request with id %d from %s",
-                inbound_message,
-                request_id,
-                encode_hex(sender_node_id),
-            )
-            send_channel = self.response_handler_send_channels[
-                sender_node_id, request_id
-            ]
-            await send_channel.send(inbound_message)
+        return tuple(
+            send_channel
+            for send_channel in (request_send_channel, response_send_channel)
+            if send_channel is not None
+        )
 
     def get_free_request_id(self, node_id: NodeID) -> int:
+        node_response_send_channels = self.response_handler_send_channels.get(
+            node_id, {}
+        )
         for _ in range(MAX_REQUEST_ID_ATTEMPTS):
             request_id = get_random_request_id()
-            if (node_id, request_id) not in self.response_handler_send_channels:
+            if request_id not in node_response_send_channels:
                 return request_id
         else:
             # this should be extremely unlikely to happen
             raise ValueError(
-                f"Failed to get free request id ({len(self.response_handler_send_channels)} "
-                f"handlers added right now)"
+                f"Failed to get free request id ({len(node_response_send_channels)} "
+                f"handlers added for the peer right now)"
             )
 
     def add_request_handler(
@@ -191,7 +298,9 @@ class MessageDispatcher(Service, MessageDispatcherAPI):
                 f"Request handler for {message_class.__name__} is already added"
             )
 
-        request_channels = trio.open_memory_channel[InboundMessage[TBaseMessage]](0)
+        request_channels = trio.open_memory_channel[InboundMessage[TBaseMessage]](
+            REQUEST_CHANNEL_BUFFER
+        )
         self.request_handler_send_channels[message_type] = request_channels[0]
 
         self.logger.debug("Adding request handler for %s", message_class.__name__)
@@ -217,37 +326,47 @@ class MessageDispatcher(Service, MessageDispatcherAPI):
     def add_response_handler(
         self, remote_node_id: NodeID, request_id: int
     ) -> AnyInboundMessageSubscription:
-        if (remote_node_id, request_id) in self.response_handler_send_channels:
+        node_response_send_channels = self.response_handler_send_channels.setdefault(
+            remote_node_id, {}
+        )
+        if request_id in node_response_send_channels:
             raise ValueError(
                 f"Response handler for node id {encode_hex(remote_node_id)} and request id "
                 f"{request_id} has already been added"
             )
 
-        self.logger.debug(
-            "Adding response handler for peer %s and request id %d",
-            encode_hex(remote_node_id),
-            request_id,
-        )
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Adding response handler for peer %s and request id %d",
+                encode_hex(remote_node_id),
+                request_id,
+            )
 
-        response_channels = trio.open_memory_channel[AnyInboundMessage](0)
-        self.response_handler_send_channels[
-            (remote_node_id, request_id)
-        ] = response_channels[0]
+        response_channels = trio.open_memory_channel[AnyInboundMessage](
+            RESPONSE_CHANNEL_BUFFER
+        )
+        node_response_send_channels[request_id] = response_channels[0]
 
         def remove() -> None:
             try:
-                self.response_handler_send_channels.pop((remote_node_id, request_id))
+                node_response_send_channels = self.response_handler_send_channels[
+                    remote_node_id
+                ]
+                node_response_send_channels.pop(request_id)
             except KeyError:
                 raise ValueError(
                     f"Response handler for node id {encode_hex(remote_node_id)} and request id "
                     f"{request_id} has already been removed"
                 )
             else:
-                self.logger.debug(
-                    "Removing response handler for peer %s and request id %d",
-                    encode_hex(remote_node_id),
-                    request_id,
-                )
+                if not node_response_send_channels:
+                    del self.response_handler_send_channels[remote_node_id]
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        "Removing response handler for peer %s and request id %d",
+                        encode_hex(remote_node_id),
+                        request_id,
+                    )
 
         return AnyInboundMessageSubscription(
             send_channel=response_channels[0],
@@ -287,9 +406,6 @@ class MessageDispatcher(Service, MessageDispatcherAPI):
         if endpoint is None:
             endpoint = await self.get_endpoint_from_enr_db(receiver_node_id)
 
-        response_channels = trio.open_memory_channel[AnyInboundMessage](0)
-        response_send_channel, response_receive_channel = response_channels
-
         async with self.add_response_handler(
             receiver_node_id, message.request_id
         ) as response_subscription:
@@ -298,12 +414,13 @@ class MessageDispatcher(Service, MessageDispatcherAPI):
                 receiver_node_id=receiver_node_id,
                 receiver_endpoint=endpoint,
             )
-            self.logger.debug(
-                "Sending %s to %s with request id %d",
-                outbound_message,
-                encode_hex(receiver_node_id),
-                message.request_id,
-            )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "Sending %s to %s with request id %d",
+                    outbound_message,
+                    encode_hex(receiver_node_id),
+                    message.request_id,
+                )
             await self.outbound_message_send_channel.send(outbound_message)
             yield response_subscription
 
@@ -317,12 +434,13 @@ class MessageDispatcher(Service, MessageDispatcherAPI):
             receiver_node_id, message, endpoint
         ) as response_subscription:
             response = await response_subscription.receive()
-            self.logger.debug(
-                "Received %s from %s with request id %d",
-                response,
-                encode_hex(receiver_node_id),
-                message.request_id,
-            )
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(
+                    "Received %s from %s with request id %d",
+                    response,
+                    encode_hex(receiver_node_id),
+                    message.request_id,
+                )
             return response
 
     async def request_nodes(
@@ -334,13 +452,17 @@ class MessageDispatcher(Service, MessageDispatcherAPI):
         async with self.request_response_subscription(
             receiver_node_id, message, endpoint
         ) as response_subscription:
+            debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+            hex_receiver = encode_hex(receiver_node_id) if debug_enabled else ""
+
             first_response = await response_subscription.receive()
-            self.logger.debug(
-                "Received %s from %s with request id %d",
-                first_response,
-                encode_hex(receiver_node_id),
-                message.request_id,
-            )
+            if debug_enabled:
+                self.logger.debug(
+                    "Received %s from %s with request id %d",
+                    first_response,
+                    hex_receiver,
+                    message.request_id,
+                )
             if not isinstance(first_response.message, NodesMessage):
                 raise UnexpectedMessage(
                     f"Peer {encode_hex(receiver_node_id)} responded with "
@@ -353,28 +475,31 @@ class MessageDispatcher(Service, MessageDispatcherAPI):
                     f"Peer {encode_hex(receiver_node_id)} sent nodes message with a total value of "
                     f"{total} which is too big"
                 )
-            self.logger.debug(
-                "Received nodes response %d of %d from %s with request id %d",
-                1,
-                total,
-                encode_hex(receiver_node_id),
-                message.request_id,
-            )
+            if debug_enabled:
+                self.logger.debug(
+                    "Received nodes response %d of %d from %s with request id %d",
+                    1,
+                    total,
+                    hex_receiver,
+                    message.request_id,
+                )
 
-            responses = [first_response]
+            # the slots after the first are overwritten as the responses arrive
+            responses = [first_response] * max(total, 1)
             for response_index in range(1, total):
                 next_response = await response_subscription.receive()
-                if not isinstance(first_response.message, NodesMessage):
+                if not isinstance(next_response.message, NodesMessage):
                     raise UnexpectedMessage(
                         f"Peer {encode_hex(receiver_node_id)} responded with "
                         f"{next_response.message.__class__.__name__} instead of Nodes message"
                     )
-                responses.append(next_response)
-                self.logger.debug(
-                    "Received nodes response %d of %d from %s with request id %d",
-                    response_index + 1,
-                    total,
-                    encode_hex(receiver_node_id),
-                    message.request_id,
-                )
+                responses[response_index] = next_response
+                if debug_enabled:
+                    self.logger.debug(
+                        "Received nodes response %d of %d from %s with request id %d",
+                        response_index + 1,
+                        total,
+                        hex_receiver,
+                        message.request_id,
+                    )
             return tuple(responses)
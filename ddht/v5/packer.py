@@ -1,4 +1,5 @@
 import logging
+import os
 from typing import Dict, List, NamedTuple, Optional
 
 from async_service import LifecycleError, Service, TrioManager
@@ -19,7 +20,11 @@ from ddht.v5.constants import HANDSHAKE_TIMEOUT
 from ddht.v5.handshake import HandshakeInitiator, HandshakeRecipient
 from ddht.v5.messages import BaseMessage
 from ddht.v5.packets import AuthTagPacket, get_random_auth_tag
-from ddht.v5.tags import compute_tag, recover_source_id_from_tag
+from ddht.v5.tags import (
+    compute_node_id_hash,
+    compute_tag,
+    recover_source_id_from_tag_with_hash,
+)
 
 
 class PeerPacker(Service):
@@ -39,6 +44,7 @@ class PeerPacker(Service):
         inbound_message_send_channel: SendChannel[AnyInboundMessage],
         outbound_message_receive_channel: ReceiveChannel[AnyOutboundMessage],
         outbound_packet_send_channel: SendChannel[OutboundPacket],
+        handshake_thread_limiter: Optional[trio.CapacityLimiter] = None,
     ) -> None:
         self.local_private_key = local_private_key
         self.local_node_id = local_node_id
@@ -51,6 +57,10 @@ class PeerPacker(Service):
         self.outbound_message_receive_channel = outbound_message_receive_channel
         self.outbound_packet_send_channel = outbound_packet_send_channel
 
+        # Limits the worker threads used to complete handshakes, `None` falls
+        # back to trio's default thread limiter.
+        self.handshake_thread_limiter = handshake_thread_limiter
+
         self.logger = logging.getLogger(
             f"ddht.v5.packer.PeerPacker[{encode_hex(remote_node_id)[2:10]}]"
         )
@@ -161,7 +171,14 @@ class PeerPacker(Service):
             return
 
         try:
-            handshake_result = self.handshake_participant.complete_handshake(packet)
+            # The key agreement and decryption are CPU bound, so they are run in
+            # a worker thread to avoid stalling the event loop. `handling_lock`
+            # is held meanwhile, so the handshake state can't change under us.
+            handshake_result = await trio.to_thread.run_sync(
+                self.handshake_participant.complete_handshake,
+                packet,
+                limiter=self.handshake_thread_limiter,
+            )
         except HandshakeFailure as handshake_failure:
             self.logger.debug(
                 "Handshake with %s has failed: %s",
@@ -449,6 +466,7 @@ class Packer(Service):
     ) -> None:
         self.local_private_key = local_private_key
         self.local_node_id = local_node_id
+        self._local_node_id_hash = compute_node_id_hash(local_node_id)
         self.enr_db = enr_db
         self.message_type_registry = message_type_registry
 
@@ -461,6 +479,9 @@ class Packer(Service):
 
         self.managed_peer_packers: Dict[NodeID, ManagedPeerPacker] = {}
 
+        # shared by all peer packers so that handshakes don't oversubscribe the CPUs
+        self.handshake_thread_limiter = trio.CapacityLimiter(os.cpu_count() or 1)
+
     async def run(self) -> None:
         self.manager.run_daemon_task(self.handle_inbound_packets)
         self.manager.run_daemon_task(self.handle_outbound_messages)
@@ -504,7 +525,9 @@ class Packer(Service):
 
             elif isinstance(inbound_packet.packet, AuthTagPacket):
                 tag = inbound_packet.packet.tag
-                remote_node_id = recover_source_id_from_tag(tag, self.local_node_id)
+                remote_node_id = recover_source_id_from_tag_with_hash(
+                    tag, self._local_node_id_hash
+                )
 
                 if not self.is_peer_packer_registered(remote_node_id):
                     self.logger.debug(
@@ -593,6 +616,7 @@ class Packer(Service):
             inbound_message_send_channel=self.inbound_message_send_channel.clone(),  # type: ignore  # noqa: E501
             outbound_message_receive_channel=outbound_message_channels[1],
             outbound_packet_send_channel=self.outbound_packet_send_channel.clone(),  # type: ignore
+            handshake_thread_limiter=self.handshake_thread_limiter,
         )
 
         manager = TrioManager(peer_packer)
@@ -517,3 +517,9 @@ def get_random_id_nonce() -> IDNonce:
 
 def get_random_auth_tag() -> Nonce:
     return Nonce(secrets.token_bytes(NONCE_SIZE))
+
+
+def get_random_auth_tag_and_encrypted_data() -> Tuple[Nonce, bytes]:
+    # both values are drawn from a single read of the CSPRNG
+    random_bytes = secrets.token_bytes(NONCE_SIZE + RANDOM_ENCRYPTED_DATA_SIZE)
+    return Nonce(random_bytes[:NONCE_SIZE]), random_bytes[NONCE_SIZE:]
@@ -6,15 +6,32 @@ from ddht._utils import sxor
 from ddht.v5.typing import Tag
 
 
+def compute_node_id_hash(node_id: NodeID) -> bytes:
+    """Compute the hash of a node id that is mixed into the tags addressed to it."""
+    return hashlib.sha256(node_id).digest()
+
+
 def compute_tag(source_node_id: NodeID, destination_node_id: NodeID) -> Tag:
     """Compute the tag used in message packets sent between two nodes."""
-    destination_node_id_hash = hashlib.sha256(destination_node_id).digest()
+    destination_node_id_hash = compute_node_id_hash(destination_node_id)
     tag = sxor(destination_node_id_hash, source_node_id)
     return Tag(tag)
 
 
 def recover_source_id_from_tag(tag: Tag, destination_node_id: NodeID) -> NodeID:
     """Recover the node id of the source from the tag in a message packet."""
-    destination_node_id_hash = hashlib.sha256(destination_node_id).digest()
+    destination_node_id_hash = compute_node_id_hash(destination_node_id)
+    return recover_source_id_from_tag_with_hash(tag, destination_node_id_hash)
+
+
+def recover_source_id_from_tag_with_hash(
+    tag: Tag, destination_node_id_hash: bytes
+) -> NodeID:
+    """
+    Recover the node id of the source from the tag in a message packet.
+
+    Unlike `recover_source_id_from_tag` this takes the precomputed hash of the
+    destination node id, see `compute_node_id_hash`.
+    """
     source_node_id = sxor(tag, destination_node_id_hash)
     return NodeID(source_node_id)
@@ -3,11 +3,10 @@ from dataclasses import dataclass
 import pathlib
 from typing import Literal, Optional, Sequence, Tuple, TypedDict, Union
 
-from eth_enr import ENR
 from eth_enr.abc import ENRAPI
 
 from ddht.v5_1.alexandria.constants import (
-    DEFAULT_BOOTNODES,
+    DEFAULT_BOOTNODE_ENRS,
     DEFAULT_COMMONS_STORAGE_SIZE,
     DEFAULT_MAX_ADVERTISEMENTS,
 )
@@ -24,9 +23,13 @@ class AlexandriaBootInfoKwargs(TypedDict, total=False):
     pinned_storage: Optional[Union[Literal[":memory:"], pathlib.Path]]
 
 
+def _resolve(path: str) -> pathlib.Path:
+    return pathlib.Path(path).expanduser().resolve()
+
+
 def _cli_args_to_boot_info_kwargs(args: argparse.Namespace) -> AlexandriaBootInfoKwargs:
     if args.alexandria_bootnodes is None:
-        bootnodes = tuple(ENR.from_repr(enr_repr) for enr_repr in DEFAULT_BOOTNODES)
+        bootnodes = DEFAULT_BOOTNODE_ENRS
     else:
         bootnodes = args.alexandria_bootnodes
 
@@ -49,9 +52,7 @@ def _cli_args_to_boot_info_kwargs(args: argparse.Namespace) -> AlexandriaBootInf
     if args.alexandria_commons_storage == ":memory:":
         commons_storage = ":memory:"
     elif args.alexandria_commons_storage is not None:
-        commons_storage = (
-            pathlib.Path(args.alexandria_commons_storage).expanduser().resolve()
-        )
+        commons_storage = _resolve(args.alexandria_commons_storage)
     else:
         commons_storage = None
 
@@ -60,9 +61,7 @@ def _cli_args_to_boot_info_kwargs(args: argparse.Namespace) -> AlexandriaBootInf
     if args.alexandria_pinned_storage == ":memory:":
         pinned_storage = ":memory:"
     elif args.alexandria_pinned_storage is not None:
-        pinned_storage = (
-            pathlib.Path(args.alexandria_pinned_storage).expanduser().resolve()
-        )
+        pinned_storage = _resolve(args.alexandria_pinned_storage)
     else:
         pinned_storage = None
 
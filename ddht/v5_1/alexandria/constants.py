@@ -1,11 +1,19 @@
 from typing import Tuple
 
+from eth_enr import ENR
+from eth_enr.abc import ENRAPI
+
 from ddht.constants import DISCOVERY_MAX_PACKET_SIZE
 
 ALEXANDRIA_PROTOCOL_ID = b"portal"
 
 DEFAULT_BOOTNODES: Tuple[str, ...] = ()
 
+# The default bootnodes parsed once at import rather than on every CLI parse
+DEFAULT_BOOTNODE_ENRS: Tuple[ENRAPI, ...] = tuple(
+    ENR.from_repr(enr_repr) for enr_repr in DEFAULT_BOOTNODES
+)
+
 # 1 gigabyte
 GB = 1024 * 1024 * 1024  # 2**30
 
@@ -1,11 +1,10 @@
 import enum
-from typing import Any, Dict, Generic, Type, TypeVar
+from typing import Any, Callable, Dict, Generic, List, Optional, Type, TypeVar
 
 import ssz
 from ssz import BaseSedes
 from ssz.exceptions import DeserializationError
 
-from ddht.constants import UINT8_TO_BYTES
 from ddht.exceptions import DecodingError
 from ddht.v5_1.alexandria.payloads import (
     FindContentPayload,
@@ -41,23 +40,26 @@ class AlexandriaMessage(Generic[TPayload]):
     sedes: BaseSedes
     payload_type: Type[TPayload]
 
+    # set by `register` to the single byte encoding of `message_id`
+    _message_id_byte: bytes
+
     payload: TPayload
 
     def __init__(self, payload: TPayload) -> None:
         self.payload = payload
 
     def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
         if type(self) is not type(other):
             return False
         return self.payload == other.payload  # type: ignore
 
     def to_wire_bytes(self) -> bytes:
-        return b"".join(
-            (
-                UINT8_TO_BYTES[self.message_id],
-                ssz.encode(self.get_payload_for_encoding(), sedes=self.sedes),
-            )
+        encoded_payload: bytes = ssz.encode(
+            self.get_payload_for_encoding(), sedes=self.sedes
         )
+        return self._message_id_byte + encoded_payload
 
     def get_payload_for_encoding(self) -> Any:
         return self.payload
@@ -72,6 +74,13 @@ class AlexandriaMessage(Generic[TPayload]):
 
 MESSAGE_REGISTRY: Dict[int, Type[AlexandriaMessage[Any]]] = {}
 
+# Message ids are small and dense so decoding indexes into flat per-id tables holding
+# the sedes and the payload constructor of each message class, rather than going
+# through the registry dict and the class attributes.  Both are maintained by
+# `register`.
+_SEDES_BY_ID: List[Optional[BaseSedes]] = []
+_FROM_PAYLOAD_ARGS_BY_ID: List[Optional[Callable[[Any], AlexandriaMessage[Any]]]] = []
+
 
 def register(message_class: Type[TAlexandriaMessage]) -> Type[TAlexandriaMessage]:
     message_id = message_class.message_id
@@ -82,7 +91,16 @@ def register(message_class: Type[TAlexandriaMessage]) -> Type[TAlexandriaMessage
             f"class={MESSAGE_REGISTRY[message_id]}"
         )
 
+    message_class._message_id_byte = bytes((message_id,))
     MESSAGE_REGISTRY[message_id] = message_class
+
+    num_missing_ids = message_id + 1 - len(_SEDES_BY_ID)
+    if num_missing_ids > 0:
+        _SEDES_BY_ID.extend([None] * num_missing_ids)
+        _FROM_PAYLOAD_ARGS_BY_ID.extend([None] * num_missing_ids)
+    _SEDES_BY_ID[message_id] = message_class.sedes
+    _FROM_PAYLOAD_ARGS_BY_ID[message_id] = message_class.from_payload_args
+
     return message_class
 
 
@@ -180,14 +198,19 @@ class FoundContentMessage(AlexandriaMessage[FoundContentPayload]):
 
 def decode_message(data: bytes) -> AlexandriaMessage[Any]:
     message_id = data[0]
-    try:
-        message_class = MESSAGE_REGISTRY[message_id]
-    except KeyError:
+    if message_id < len(_SEDES_BY_ID):
+        sedes = _SEDES_BY_ID[message_id]
+        from_payload_args = _FROM_PAYLOAD_ARGS_BY_ID[message_id]
+    else:
+        sedes = from_payload_args = None
+    if sedes is None or from_payload_args is None:
         raise DecodingError(f"Unknown message type: id={message_id}")
 
+    # The payload is sliced into a new `bytes` object because `ssz.decode` only
+    # accepts `bytes` or `bytearray` and raises a `TypeError` for a `memoryview`.
     try:
-        payload_args = ssz.decode(data[1:], sedes=message_class.sedes)
+        payload_args = ssz.decode(data[1:], sedes=sedes)
     except DeserializationError as err:
         raise DecodingError(str(err)) from err
 
-    return message_class.from_payload_args(payload_args)
+    return from_payload_args(payload_args)
@@ -1,3 +1,4 @@
+import functools
 from typing import NamedTuple, Sequence, Tuple
 
 from eth_enr import ENR, ENRAPI
@@ -6,6 +7,14 @@ import rlp
 from ddht.v5_1.alexandria.typing import ContentKey
 
 
+@functools.lru_cache(maxsize=1024)
+def _decode_enr(raw_enr: bytes) -> ENRAPI:
+    # Payloads are named tuples which can't carry a cached attribute, so the decoded
+    # records are memoized by their encoding instead.
+    enr: ENRAPI = rlp.decode(raw_enr, sedes=ENR)
+    return enr
+
+
 class PingPayload(NamedTuple):
     enr_seq: int
     advertisement_radius: int
@@ -27,12 +36,12 @@ class FoundNodesPayload(NamedTuple):
     @property
     def enrs(self) -> Tuple[ENRAPI]:
         return tuple(  # type: ignore
-            rlp.decode(raw_enr, sedes=ENR) for raw_enr in self.encoded_enrs
+            _decode_enr(raw_enr) for raw_enr in self.encoded_enrs
         )
 
     @classmethod
     def from_enrs(cls, total: int, enrs: Sequence[ENRAPI]) -> "FoundNodesPayload":
-        encoded_enrs = tuple(rlp.encode(enr) for enr in enrs)
+        encoded_enrs = tuple([rlp.encode(enr) for enr in enrs])
         return cls(total, encoded_enrs)
 
 
@@ -51,5 +60,5 @@ class FoundContentPayload(NamedTuple):
     @property
     def enrs(self) -> Tuple[ENRAPI]:
         return tuple(  # type: ignore
-            rlp.decode(raw_enr, sedes=ENR) for raw_enr in self.encoded_enrs
+            _decode_enr(raw_enr) for raw_enr in self.encoded_enrs
         )
@@ -1,18 +1,13 @@
+import functools
 from socket import inet_ntoa
-from typing import Any, Iterable, List, Optional, Sequence, Tuple, TypedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple, TypedDict
 
 from eth_enr import ENR
 from eth_enr.abc import ENRAPI
 from eth_enr.exceptions import OldSequenceNumber
 from eth_typing import HexStr, NodeID
-from eth_utils import (
-    ValidationError,
-    decode_hex,
-    encode_hex,
-    is_list_like,
-    to_bytes,
-    to_dict,
-)
+from eth_utils import ValidationError, decode_hex, encode_hex, is_list_like, to_bytes
+from lru import LRU
 
 from ddht.abc import RPCHandlerAPI
 from ddht.endpoint import Endpoint
@@ -41,21 +36,61 @@ class GetENRResponse(TypedDict):
     enr_repr: str
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_enr(enr_repr: str) -> ENRAPI:
+    # Parsing involves decoding the record and verifying its signature so clients
+    # that repeatedly post the same record only pay for it once.
+    return ENR.from_repr(enr_repr)
+
+
+@functools.lru_cache(maxsize=4096)
+def _ip_to_str(packed_ip: bytes) -> str:
+    return inet_ntoa(packed_ip)
+
+
+@functools.lru_cache(maxsize=4096)
+def _decode_request_id(request_id: HexStr) -> bytes:
+    # the same request id is sent repeatedly when a response is retried
+    return decode_hex(request_id)
+
+
+# The textual representations of ENRs, keyed by node id, sequence number and
+# signature.  The signature is needed as a node that lost its database may sign a
+# different record with a sequence number it used before.
+ENR_REPR_CACHE_SIZE = 4096
+_enr_repr_cache: "LRU[Tuple[NodeID, int, bytes], str]" = LRU(ENR_REPR_CACHE_SIZE)
+
+
+def _enr_repr(enr: ENRAPI) -> str:
+    key = (enr.node_id, enr.sequence_number, enr.signature)
+    try:
+        enr_repr = _enr_repr_cache[key]
+    except KeyError:
+        enr_repr = _enr_repr_cache[key] = repr(enr)
+    return enr_repr
+
+
 def extract_params(request: RPCRequest) -> List[Any]:
     try:
         params = request["params"]
     except KeyError:
         raise RPCError("Request missing `params` key")
 
-    if not is_list_like(params):
+    # JSON decoding produces plain lists so the generic list-like check is only needed
+    # for requests that were constructed some other way.
+    if type(params) is list:
+        return params
+    elif is_list_like(params):
+        return list(params)
+    else:
         raise RPCError(
             f"Params must be list-like: params-type={type(params)} params={params}"
         )
 
-    return params
-
 
 class PingHandler(RPCHandler[Tuple[NodeID, Optional[Endpoint]], PongResponse]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -73,14 +108,16 @@ class PingHandler(RPCHandler[Tuple[NodeID, Optional[Endpoint]], PongResponse]):
     async def do_call(self, params: Tuple[NodeID, Optional[Endpoint]]) -> PongResponse:
         node_id, endpoint = params
         pong = await self._network.ping(node_id, endpoint=endpoint)
-        return PongResponse(
-            enr_seq=pong.enr_seq,
-            packet_ip=inet_ntoa(pong.packet_ip),
-            packet_port=pong.packet_port,
-        )
+        return {
+            "enr_seq": pong.enr_seq,
+            "packet_ip": _ip_to_str(pong.packet_ip),
+            "packet_port": pong.packet_port,
+        }
 
 
 class SendPingHandler(RPCHandler[Tuple[NodeID, Optional[Endpoint]], SendPingResponse]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -99,10 +136,12 @@ class SendPingHandler(RPCHandler[Tuple[NodeID, Optional[Endpoint]], SendPingResp
             enr = await self._network.lookup_enr(node_id)
             endpoint = Endpoint.from_enr(enr)
         request_id = await self._network.client.send_ping(node_id, endpoint)
-        return SendPingResponse(request_id=encode_hex(request_id))
+        return {"request_id": HexStr("0x" + request_id.hex())}
 
 
 class SendPongHandler(RPCHandler[Tuple[NodeID, Optional[Endpoint], HexStr], None]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -121,7 +160,7 @@ class SendPongHandler(RPCHandler[Tuple[NodeID, Optional[Endpoint], HexStr], None
             enr = await self._network.lookup_enr(node_id)
             endpoint = Endpoint.from_enr(enr)
         response = await self._network.client.send_pong(
-            node_id, endpoint, request_id=decode_hex(request_id)
+            node_id, endpoint, request_id=_decode_request_id(request_id)
         )
         return response
 
@@ -130,6 +169,8 @@ FindNodesRPCParams = Tuple[NodeID, Optional[Endpoint], Tuple[int, ...]]
 
 
 class FindNodesHandler(RPCHandler[FindNodesRPCParams, Tuple[str, ...]]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -145,10 +186,12 @@ class FindNodesHandler(RPCHandler[FindNodesRPCParams, Tuple[str, ...]]):
     async def do_call(self, params: FindNodesRPCParams) -> Tuple[str, ...]:
         node_id, endpoint, distances = params
         enrs = await self._network.find_nodes(node_id, *distances, endpoint=endpoint)
-        return tuple(repr(enr) for enr in enrs)
+        return tuple([_enr_repr(enr) for enr in enrs])
 
 
 class SendFindNodesHandler(RPCHandler[FindNodesRPCParams, HexStr]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -175,6 +218,8 @@ SendFoundNodesRPCParams = Tuple[NodeID, Optional[Endpoint], Sequence[ENRAPI], by
 
 
 class SendFoundNodesHandler(RPCHandler[SendFoundNodesRPCParams, int]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -202,6 +247,8 @@ TalkRPCParams = Tuple[NodeID, Optional[Endpoint], bytes, bytes]
 
 
 class SendTalkRequestHandler(RPCHandler[TalkRPCParams, HexStr]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -230,6 +277,8 @@ class SendTalkRequestHandler(RPCHandler[TalkRPCParams, HexStr]):
 
 
 class SendTalkResponseHandler(RPCHandler[TalkRPCParams, None]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -258,6 +307,8 @@ class SendTalkResponseHandler(RPCHandler[TalkRPCParams, None]):
 
 
 class TalkHandler(RPCHandler[TalkRPCParams, HexStr]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -286,6 +337,8 @@ class TalkHandler(RPCHandler[TalkRPCParams, HexStr]):
 
 
 class RecursiveFindNodesHandler(RPCHandler[NodeID, Tuple[str, ...]]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -305,10 +358,12 @@ class RecursiveFindNodesHandler(RPCHandler[NodeID, Tuple[str, ...]]):
                     key=lambda enr: compute_distance(node_id, enr.node_id),
                 )
             )
-        return tuple(repr(node) for node in found_nodes)
+        return tuple([_enr_repr(node) for node in found_nodes])
 
 
 class BondHandler(RPCHandler[Tuple[NodeID, Optional[Endpoint]], int]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -325,6 +380,8 @@ class BondHandler(RPCHandler[Tuple[NodeID, Optional[Endpoint]], int]):
 
 
 class GetENRHandler(RPCHandler[NodeID, GetENRResponse]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -337,10 +394,12 @@ class GetENRHandler(RPCHandler[NodeID, GetENRResponse]):
 
     async def do_call(self, params: NodeID) -> GetENRResponse:
         response = self._network.enr_db.get_enr(params)
-        return GetENRResponse(enr_repr=repr(response))
+        return {"enr_repr": _enr_repr(response)}
 
 
 class SetENRHandler(RPCHandler[ENRAPI, None]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -348,8 +407,10 @@ class SetENRHandler(RPCHandler[ENRAPI, None]):
         raw_params = extract_params(request)
         validate_params_length(raw_params, 1)
         enr_repr = raw_params[0]
+        if not isinstance(enr_repr, str):
+            raise RPCError(f"Invalid ENR repr: {enr_repr}")
         try:
-            enr = ENR.from_repr(enr_repr)
+            enr = _parse_enr(enr_repr)
         except ValidationError:
             raise RPCError(f"Invalid ENR repr: {enr_repr}")
         return enr
@@ -363,6 +424,8 @@ class SetENRHandler(RPCHandler[ENRAPI, None]):
 
 
 class DeleteENRHandler(RPCHandler[NodeID, None]):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -381,6 +444,8 @@ class DeleteENRHandler(RPCHandler[NodeID, None]):
 class LookupENRHandler(
     RPCHandler[Tuple[NodeID, Optional[Endpoint], int], GetENRResponse]
 ):
+    __slots__ = ("_network",)
+
     def __init__(self, network: NetworkAPI) -> None:
         self._network = network
 
@@ -406,23 +471,24 @@ class LookupENRHandler(
         response = await self._network.lookup_enr(
             node_id, enr_seq=sequence_number, endpoint=endpoint
         )
-        return GetENRResponse(enr_repr=repr(response))
-
-
-@to_dict
-def get_v51_rpc_handlers(network: NetworkAPI) -> Iterable[Tuple[str, RPCHandlerAPI]]:
-    yield ("discv5_bond", BondHandler(network))
-    yield ("discv5_deleteENR", DeleteENRHandler(network))
-    yield ("discv5_findNodes", FindNodesHandler(network))
-    yield ("discv5_getENR", GetENRHandler(network))
-    yield ("discv5_lookupENR", LookupENRHandler(network))
-    yield ("discv5_ping", PingHandler(network))
-    yield ("discv5_recursiveFindNodes", RecursiveFindNodesHandler(network))
-    yield ("discv5_sendFindNodes", SendFindNodesHandler(network))
-    yield ("discv5_sendFoundNodes", SendFoundNodesHandler(network))
-    yield ("discv5_sendPing", SendPingHandler(network))
-    yield ("discv5_sendPong", SendPongHandler(network))
-    yield ("discv5_sendTalkRequest", SendTalkRequestHandler(network))
-    yield ("discv5_sendTalkResponse", SendTalkResponseHandler(network))
-    yield ("discv5_setENR", SetENRHandler(network))
-    yield ("discv5_talk", TalkHandler(network))
+        return {"enr_repr": _enr_repr(response)}
+
+
+def get_v51_rpc_handlers(network: NetworkAPI) -> Dict[str, RPCHandlerAPI]:
+    return {
+        "discv5_bond": BondHandler(network),
+        "discv5_deleteENR": DeleteENRHandler(network),
+        "discv5_findNodes": FindNodesHandler(network),
+        "discv5_getENR": GetENRHandler(network),
+        "discv5_lookupENR": LookupENRHandler(network),
+        "discv5_ping": PingHandler(network),
+        "discv5_recursiveFindNodes": RecursiveFindNodesHandler(network),
+        "discv5_sendFindNodes": SendFindNodesHandler(network),
+        "discv5_sendFoundNodes": SendFoundNodesHandler(network),
+        "discv5_sendPing": SendPingHandler(network),
+        "discv5_sendPong": SendPongHandler(network),
+        "discv5_sendTalkRequest": SendTalkRequestHandler(network),
+        "discv5_sendTalkResponse": SendTalkResponseHandler(network),
+        "discv5_setENR": SetENRHandler(network),
+        "discv5_talk": TalkHandler(network),
+    }
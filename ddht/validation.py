@@ -1,3 +1,4 @@
+import functools
 import ipaddress
 from typing import Any, Collection, Iterable, List, Optional, Tuple
 
@@ -111,6 +112,22 @@ def validate_and_convert_hexstr(*args: Any) -> Iterable[bytes]:
 
 
 def validate_and_extract_destination(value: Any) -> Tuple[NodeID, Optional[Endpoint]]:
+    if isinstance(value, str):
+        return _validate_and_extract_str_destination(value)
+    else:
+        return _validate_and_extract_destination(value)
+
+
+@functools.lru_cache(maxsize=2048)
+def _validate_and_extract_str_destination(
+    value: str,
+) -> Tuple[NodeID, Optional[Endpoint]]:
+    # RPC calls tend to target the same few peers over and over so the parsed
+    # destinations are memoized.  Invalid destinations raise and are not cached.
+    return _validate_and_extract_destination(value)
+
+
+def _validate_and_extract_destination(value: Any) -> Tuple[NodeID, Optional[Endpoint]]:
     node_id: NodeID
     endpoint: Optional[Endpoint]
 
@@ -0,0 +1,22 @@
+import pytest
+
+from ddht.abc import HandshakeSchemeRegistryAPI, MessageTypeRegistryAPI
+from ddht.handshake_schemes import HandshakeSchemeRegistry
+from ddht.message_registry import MessageTypeRegistry
+
+
+@pytest.mark.parametrize(
+    "registry_api_class", (MessageTypeRegistryAPI, HandshakeSchemeRegistryAPI),
+)
+def test_registry_api_is_abstract(registry_api_class):
+    with pytest.raises(TypeError, match="abstract"):
+        registry_api_class()
+
+
+@pytest.mark.parametrize(
+    "registry_class", (MessageTypeRegistry, HandshakeSchemeRegistry),
+)
+def test_registry_is_a_dict(registry_class):
+    registry = registry_class()
+    assert isinstance(registry, dict)
+    assert len(registry) == 0
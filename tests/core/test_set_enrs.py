@@ -0,0 +1,28 @@
+import sqlite3
+
+from eth_enr import QueryableENRDB
+from eth_enr.tools.factories import ENRFactory
+
+from ddht.enr import set_enrs
+
+
+def test_set_enrs_writes_all_records():
+    enr_db = QueryableENRDB(sqlite3.connect(":memory:"))
+    enrs = ENRFactory.create_batch(5)
+
+    set_enrs(enr_db, enrs)
+
+    for enr in enrs:
+        assert enr_db.get_enr(enr.node_id) == enr
+
+
+def test_set_enrs_skips_known_sequence_numbers():
+    enr_db = QueryableENRDB(sqlite3.connect(":memory:"))
+    known_enr = ENRFactory()
+    enr_db.set_enr(known_enr)
+    new_enr = ENRFactory()
+
+    set_enrs(enr_db, (known_enr, new_enr, known_enr))
+
+    assert enr_db.get_enr(known_enr.node_id) == known_enr
+    assert enr_db.get_enr(new_enr.node_id) == new_enr
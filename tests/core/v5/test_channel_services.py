@@ -1,7 +1,10 @@
+from socket import inet_aton
+
 from async_service import background_trio_service
 import pytest
 import trio
 
+from ddht.endpoint import Endpoint
 from ddht.tools.factories.discovery import AuthTagPacketFactory
 from ddht.tools.factories.endpoint import EndpointFactory
 from ddht.v5.channel_services import (
@@ -9,6 +12,7 @@ from ddht.v5.channel_services import (
     OutboundPacket,
     PacketDecoder,
     PacketEncoder,
+    PacketIO,
 )
 
 
@@ -89,3 +93,39 @@ async def test_packet_encoder():
             == receiver_endpoint.ip_address
         )
         assert outbound_datagram.receiver_endpoint.port == receiver_endpoint.port
+
+
+@pytest.mark.trio
+async def test_packet_io(socket_pair):
+    sending_socket, receiving_socket = socket_pair
+    sender_address = sending_socket.getsockname()
+    receiver_address = receiving_socket.getsockname()
+
+    outbound_send_channel, outbound_receive_channel = trio.open_memory_channel(1)
+    inbound_send_channel, inbound_receive_channel = trio.open_memory_channel(1)
+
+    sender_service = PacketIO(
+        sending_socket, outbound_receive_channel, trio.open_memory_channel(1)[0]
+    )
+    receiver_service = PacketIO(
+        receiving_socket, trio.open_memory_channel(1)[1], inbound_send_channel
+    )
+    async with background_trio_service(sender_service):
+        async with background_trio_service(receiver_service):
+            # invalid datagrams are dropped
+            await sending_socket.sendto(b"not a valid packet", receiver_address)
+
+            packet = AuthTagPacketFactory()
+            receiver_endpoint = Endpoint(
+                inet_aton(receiver_address[0]), receiver_address[1]
+            )
+            await outbound_send_channel.send(OutboundPacket(packet, receiver_endpoint))
+
+            with trio.fail_after(0.5):
+                inbound_packet = await inbound_receive_channel.receive()
+
+            assert inbound_packet.packet == packet
+            assert inbound_packet.sender_endpoint.ip_address == inet_aton(
+                sender_address[0]
+            )
+            assert inbound_packet.sender_endpoint.port == sender_address[1]
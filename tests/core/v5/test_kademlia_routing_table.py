@@ -197,6 +197,29 @@ def test_fill_bucket(routing_table, center_node_id, bucket_size):
 def test_add_center(routing_table, center_node_id):
     with pytest.raises(ValueError):
         routing_table.update(center_node_id)
+    with pytest.raises(ValueError):
+        routing_table.bulk_update((center_node_id,))
+
+
+def test_bulk_update_matches_update(center_node_id, bucket_size):
+    node_ids = tuple(
+        NodeIDFactory.at_log_distance(center_node_id, distance)
+        for distance in (1, 200, 200, 200, 255, 200, 1)
+    )
+    node_ids += node_ids[1:3]
+
+    expected_routing_table = KademliaRoutingTable(center_node_id, bucket_size)
+    for node_id in node_ids:
+        expected_routing_table.update(node_id)
+
+    routing_table = KademliaRoutingTable(center_node_id, bucket_size)
+    routing_table.bulk_update(node_ids)
+
+    assert routing_table.buckets == expected_routing_table.buckets
+    assert routing_table.replacement_caches == expected_routing_table.replacement_caches
+    assert (
+        routing_table.bucket_update_order == expected_routing_table.bucket_update_order
+    )
 
 
 def test_get_nodes_at_log_distance(routing_table, center_node_id, bucket_size):
@@ -6,6 +6,7 @@ import pytest_trio
 import trio
 
 from ddht.base_message import InboundMessage
+from ddht.exceptions import UnexpectedMessage
 from ddht.tools.factories.discovery import PingMessageFactory
 from ddht.tools.factories.endpoint import EndpointFactory
 from ddht.tools.factories.keys import PrivateKeyFactory
@@ -125,6 +126,41 @@ async def test_response_handling(
             handled_response = await response_subscription.receive()
         assert handled_response == inbound_message
 
+    assert remote_enr.node_id not in message_dispatcher.response_handler_send_channels
+
+
+@pytest.mark.trio
+async def test_batched_response_handling(
+    message_dispatcher, remote_enr, remote_endpoint, nursery
+):
+    request_id = message_dispatcher.get_free_request_id(remote_enr.node_id)
+    async with message_dispatcher.add_response_handler(
+        remote_enr.node_id, request_id,
+    ) as response_subscription:
+        inbound_messages = tuple(
+            InboundMessage(
+                message=PingMessageFactory(request_id=request_id, enr_seq=enr_seq),
+                sender_endpoint=remote_endpoint,
+                sender_node_id=remote_enr.node_id,
+            )
+            for enr_seq in range(3)
+        )
+        unhandled_message = InboundMessage(
+            message=PingMessageFactory(request_id=request_id + 1),
+            sender_endpoint=remote_endpoint,
+            sender_node_id=remote_enr.node_id,
+        )
+        nursery.start_soon(
+            message_dispatcher.handle_inbound_messages,
+            inbound_messages[:2] + (unhandled_message,) + inbound_messages[2:],
+        )
+
+        with trio.fail_after(1):
+            handled_responses = tuple(
+                [await response_subscription.receive() for _ in range(3)]
+            )
+        assert handled_responses == inbound_messages
+
 
 @pytest.mark.trio
 async def test_request(
@@ -212,3 +248,37 @@ async def test_request_nodes(
         assert received_response.sender_endpoint == remote_endpoint
         assert received_response.sender_node_id == remote_enr.node_id
         assert received_response.message == expected_response_message
+
+
+@pytest.mark.trio
+async def test_request_nodes_with_unexpected_follow_up_response(
+    message_dispatcher,
+    remote_enr,
+    remote_endpoint,
+    inbound_message_channels,
+    outbound_message_channels,
+    nursery,
+):
+    request_id = message_dispatcher.get_free_request_id(remote_enr.node_id)
+    request = FindNodeMessage(request_id=request_id, distance=3,)
+    response_messages = [
+        NodesMessage(request_id=request_id, total=2, enrs=[ENRFactory()]),
+        PingMessageFactory(request_id=request_id),
+    ]
+
+    async def handle_request_on_remote():
+        async for outbound_message in outbound_message_channels[1]:
+            for response in response_messages:
+                await inbound_message_channels[0].send(
+                    InboundMessage(
+                        message=response,
+                        sender_endpoint=remote_endpoint,
+                        sender_node_id=remote_enr.node_id,
+                    )
+                )
+
+    nursery.start_soon(handle_request_on_remote)
+
+    with trio.fail_after(3):
+        with pytest.raises(UnexpectedMessage):
+            await message_dispatcher.request_nodes(remote_enr.node_id, request)
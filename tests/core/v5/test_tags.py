@@ -3,7 +3,12 @@ from hypothesis import given
 from hypothesis import strategies as st
 import pytest
 
-from ddht.v5.tags import compute_tag, recover_source_id_from_tag
+from ddht.v5.tags import (
+    compute_node_id_hash,
+    compute_tag,
+    recover_source_id_from_tag,
+    recover_source_id_from_tag_with_hash,
+)
 
 
 @given(st.binary(min_size=32, max_size=32), st.binary(min_size=32, max_size=32))
@@ -13,6 +18,14 @@ def test_source_recovery(source, destination):
     assert recovered_src == source
 
 
+@given(st.binary(min_size=32, max_size=32), st.binary(min_size=32, max_size=32))
+def test_source_recovery_with_hash(source, destination):
+    tag = compute_tag(source, destination)
+    destination_hash = compute_node_id_hash(destination)
+    recovered_src = recover_source_id_from_tag_with_hash(tag, destination_hash)
+    assert recovered_src == source
+
+
 @pytest.mark.parametrize(
     ("source", "destination", "tag"),
     (
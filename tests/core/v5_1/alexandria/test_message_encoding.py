@@ -1,8 +1,10 @@
 from eth_enr.tools.factories import ENRFactory
 from hypothesis import given
 from hypothesis import strategies as st
+import pytest
 import rlp
 
+from ddht.exceptions import DecodingError
 from ddht.v5_1.alexandria.messages import (
     FindContentMessage,
     FindNodesMessage,
@@ -96,3 +98,9 @@ def test_found_content_message_encoding_round_trip(data):
     encoded = message.to_wire_bytes()
     result = decode_message(encoded)
     assert result.payload == message.payload
+
+
+@pytest.mark.parametrize("message_id", (0, 7, 255))
+def test_decode_message_with_unknown_message_id(message_id):
+    with pytest.raises(DecodingError):
+        decode_message(bytes((message_id,)) + b"\x00" * 8)
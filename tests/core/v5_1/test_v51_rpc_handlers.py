@@ -27,7 +27,7 @@ from ddht.v5_1.messages import (
     TalkRequestMessage,
     TalkResponseMessage,
 )
-from ddht.v5_1.rpc_handlers import get_v51_rpc_handlers
+from ddht.v5_1.rpc_handlers import _enr_repr, get_v51_rpc_handlers
 
 
 @pytest.fixture
@@ -195,6 +195,24 @@ async def test_v51_rpc_get_enr_with_unseen_node_id(make_request, new_enr):
         await make_request("discv5_getENR", [repr(new_enr)])
 
 
+@pytest.mark.trio
+async def test_v51_rpc_get_enr_with_conflicting_record(make_request, alice):
+    # a node that lost its database signs a new record with an old sequence number
+    private_key = PrivateKeyFactory().to_bytes()
+    stale_enr = ENRFactory(
+        private_key=private_key, sequence_number=1, custom_kv_pairs={b"udp": 30303}
+    )
+    enr = ENRFactory(
+        private_key=private_key, sequence_number=1, custom_kv_pairs={b"udp": 30304}
+    )
+    # the stale record's repr is cached, e.g. from an earlier findNodes response
+    assert _enr_repr(stale_enr) == repr(stale_enr)
+
+    alice.enr_db.set_enr(enr)
+    response = await make_request("discv5_getENR", [enr.node_id.hex()])
+    assert response["enr_repr"] == repr(enr)
+
+
 @pytest.mark.trio
 async def test_v51_rpc_get_enr_web3(bob, bob_node_id_param_w3, w3):
     response = await trio.to_thread.run_sync(w3.discv5.get_enr, bob_node_id_param_w3)